@@ -10,12 +10,25 @@ Usage: python scan_registers.py
 Connection: EW11-A gateway at 192.168.178.121:8899 (change to 10.10.100.254
 after AP mode hardening), Modbus slave address 2.
 
-Note: Registers 200-290 must be read individually (bulk read returns
-exception code 2). This makes the scan slower for that range.
+Note: A bulk read of 200-290 returns exception code 2. Reads rejected that
+way are split in half until they succeed, and the spans that work are
+cached in ~/.midea_spans.json so later scans skip the discovery (delete the
+file to rediscover).
 
-Requires: pip install pymodbus
+Requires: Python 3.10+, pip install pymodbus
 """
+import json
+import os
+import socket
+import sys
+import textwrap
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
 from pymodbus.client import ModbusTcpClient
+from pymodbus.exceptions import ModbusException
 
 # Midea Modbus Register Scanner
 # =============================
@@ -29,7 +42,7 @@ from pymodbus.client import ModbusTcpClient
 # Bulk Read Behavior:
 #   0-22    Bulk read works
 #   100-199 Bulk read works
-#   200-290 Bulk read FAILS (Exception code 2), must read individually
+#   200-290 Bulk read FAILS (Exception code 2), read in smaller spans
 #
 # Value Encoding:
 #   - Some registers pack two values: Zone1 in low 8 bits, Zone2 in high 8 bits
@@ -38,6 +51,12 @@ from pymodbus.client import ModbusTcpClient
 #   - 65535 (0xFFFF) and 255 (0xFF) typically mean "not available" or "no sensor"
 #
 
+# Detail text shared by several reserved/undocumented registers
+_RESERVED = "Reserved for future use."
+_UNDOCUMENTED = "Undocumented register."
+_UNDOCUMENTED_GAP = "Undocumented register (gap in addressing)."
+_MIRRORS_CURVE = "Undocumented - may mirror custom curve."
+
 # Known registers from Midea Modbus mapping table
 # Format: (name, short_desc, used_in_setup, detailed_description)
 # used_in_setup: True = used in our Zone1-only heating setup, False = not used
@@ -250,9 +269,9 @@ REGISTERS = {
         "E0(1)=Water flow, E1(2)=Phase, E2(3)=Comm, E8(9)=Flow fault, "
         "P0(20)=Low press, P1(21)=High press, P4(24)=High discharge temp."),
 
-    125: ("Reserved", "", False, "Reserved for future use."),
-    126: ("Reserved", "", False, "Reserved for future use."),
-    127: ("Reserved", "", False, "Reserved for future use."),
+    125: ("Reserved", "", False, _RESERVED),
+    126: ("Reserved", "", False, _RESERVED),
+    127: ("Reserved", "", False, _RESERVED),
 
     128: ("Status bit 1", "Bit field", True,
         "Bit1: Defrosting, Bit2: Anti-freeze active, Bit3: Oil return, "
@@ -330,7 +349,7 @@ REGISTERS = {
         "Cumulative thermal energy output, low 16 bits. "
         "This is the heat delivered to the water circuit."),
 
-    147: ("Reserved", "", False, "Reserved for future use."),
+    147: ("Reserved", "", False, _RESERVED),
 
     148: ("Real-time heating capacity", "kW (x0.01)", True,
         "Current heating capacity being delivered. Value x0.01 = kW. "
@@ -600,8 +619,7 @@ REGISTERS = {
         "Time to hold disinfection temperature once reached. "
         "Ensures bacteria are killed."),
 
-    223: ("Unknown 223", "", False,
-        "Undocumented register."),
+    223: ("Unknown 223", "", False, _UNDOCUMENTED),
 
     224: ("dT1SC", "Cooling curve delta", False,
         "Temperature differential/deadband for cooling weather curve."),
@@ -617,8 +635,7 @@ REGISTERS = {
         "Minimum outdoor temperature for cooling operation. "
         "Below this, cooling is disabled."),
 
-    228: ("Unknown 228", "", False,
-        "Undocumented register."),
+    228: ("Unknown 228", "", False, _UNDOCUMENTED),
 
     229: ("dT1SH", "Heating curve delta", True,
         "Temperature differential/deadband for heating weather curve. "
@@ -649,8 +666,7 @@ REGISTERS = {
     235: ("t_IBH_delay", "IBH delay, min", False,
         "Delay time before IBH activates after conditions are met."),
 
-    236: ("Unknown 236", "", False,
-        "Undocumented register (gap in addressing)."),
+    236: ("Unknown 236", "", False, _UNDOCUMENTED_GAP),
 
     237: ("T4_AHS_on", "AHS enable temp", False,
         "Outdoor temperature to enable Auxiliary Heat Source. "
@@ -659,8 +675,7 @@ REGISTERS = {
     238: ("dT1_AHS_on", "AHS delta", False,
         "Temperature differential to activate AHS."),
 
-    239: ("Unknown 239", "", False,
-        "Undocumented register (gap in addressing)."),
+    239: ("Unknown 239", "", False, _UNDOCUMENTED_GAP),
 
     240: ("t_AHS_delay", "AHS delay, min", False,
         "Delay time before AHS activates after conditions are met."),
@@ -684,9 +699,9 @@ REGISTERS = {
     246: ("T5S_H.A_DHW", "Holiday DHW T5", False,
         "DHW temperature setpoint during holiday/away mode."),
 
-    247: ("Unknown 247", "", False, "Undocumented register."),
-    248: ("Unknown 248", "", False, "Undocumented register."),
-    249: ("Unknown 249", "", False, "Undocumented register."),
+    247: ("Unknown 247", "", False, _UNDOCUMENTED),
+    248: ("Unknown 248", "", False, _UNDOCUMENTED),
+    249: ("Unknown 249", "", False, _UNDOCUMENTED),
 
     250: ("IBH1 power", "x100 W", False,
         "Inline Booster Heater 1 power rating. Value x 100 = Watts. "
@@ -698,8 +713,8 @@ REGISTERS = {
     252: ("TBH power", "x100 W", False,
         "Tank Booster Heater power rating. Value x 100 = Watts."),
 
-    253: ("Unknown 253", "", False, "Undocumented register."),
-    254: ("Unknown 254", "", False, "Undocumented register."),
+    253: ("Unknown 253", "", False, _UNDOCUMENTED),
+    254: ("Unknown 254", "", False, _UNDOCUMENTED),
 
     255: ("t_DRYUP", "Floor dry up days", False,
         "Floor drying function - ramp up phase duration in days."),
@@ -786,14 +801,14 @@ REGISTERS = {
     279: ("t2_Antilock SV run", "s", False,
         "Solenoid valve anti-lock run time in seconds."),
 
-    280: ("Unknown 280", "", False, "Undocumented - may mirror custom curve."),
-    281: ("Unknown 281", "", False, "Undocumented - may mirror custom curve."),
-    282: ("Unknown 282", "", False, "Undocumented - may mirror custom curve."),
-    283: ("Unknown 283", "", False, "Undocumented - may mirror custom curve."),
-    284: ("Unknown 284", "", False, "Undocumented - may mirror custom curve."),
-    285: ("Unknown 285", "", False, "Undocumented - may mirror custom curve."),
-    286: ("Unknown 286", "", False, "Undocumented - may mirror custom curve."),
-    287: ("Unknown 287", "", False, "Undocumented - may mirror custom curve."),
+    280: ("Unknown 280", "", False, _MIRRORS_CURVE),
+    281: ("Unknown 281", "", False, _MIRRORS_CURVE),
+    282: ("Unknown 282", "", False, _MIRRORS_CURVE),
+    283: ("Unknown 283", "", False, _MIRRORS_CURVE),
+    284: ("Unknown 284", "", False, _MIRRORS_CURVE),
+    285: ("Unknown 285", "", False, _MIRRORS_CURVE),
+    286: ("Unknown 286", "", False, _MIRRORS_CURVE),
+    287: ("Unknown 287", "", False, _MIRRORS_CURVE),
 
     288: ("Ta_adj", "Room temp adjustment", False,
         "Room temperature sensor calibration offset."),
@@ -807,127 +822,531 @@ REGISTERS = {
 }
 
 
+@dataclass(slots=True, frozen=True)
+class RegisterInfo:
+    """One entry of REGISTERS"""
+    name: str
+    desc: str
+    used: bool  # used_in_setup
+    detail: str
+
+
+# Read-only from here on; names and short descriptions are interned since
+# they repeat a lot (Reserved, Bit field, kWh (x0.01), ...). Detailed
+# descriptions are documentation only and are dropped under python -O.
+REGISTERS = MappingProxyType({
+    addr: RegisterInfo(sys.intern(name), sys.intern(desc), used, detail if __debug__ else "")
+    for addr, (name, desc, used, detail) in REGISTERS.items()
+})
+
+# Register metadata as parallel arrays indexed by address (0-290), built once
+# at import. Unknown addresses hold None / 0. Bit0 of _USED = used_in_setup.
+MAX_ADDR = 290
+
+_NAMES = [None] * (MAX_ADDR + 1)
+_DESCS = [None] * (MAX_ADDR + 1)
+_USED = bytearray(MAX_ADDR + 1)
+_DETAILS = [None] * (MAX_ADDR + 1)
+
+for _addr, _info in REGISTERS.items():
+    _NAMES[_addr] = _info.name
+    _DESCS[_addr] = _info.desc
+    _USED[_addr] = 1 if _info.used else 0
+    _DETAILS[_addr] = _info.detail
+del _addr, _info
+
+NAME_BY_ADDR = _NAMES
+
+
+def reg_name(addr):
+    """Register name, or None if the address is not documented"""
+    return _NAMES[addr]
+
+
+def reg_detail(addr):
+    """Detailed description, empty if undocumented or running under -O"""
+    return _DETAILS[addr] or ""
+
+
+def reg_used(addr):
+    """True if the register is used in our Zone1-only heating setup"""
+    return bool(_USED[addr] & 1)
+
+
+# Documented addresses split by used_in_setup, sorted
+USED_ADDRS = tuple(addr for addr, flags in enumerate(_USED) if flags & 1)
+UNUSED_ADDRS = tuple(sorted(addr for addr in REGISTERS if not _USED[addr] & 1))
+USED_ADDRS_SET = frozenset(USED_ADDRS)
+
+
+# Read planning for polling a set of registers (e.g. the used ones) with a
+# fixed plan. Addresses inside a known bulk-readable range are merged into
+# (start, count) blocks, bridging gaps of unused registers, split at the
+# 23-99 gap and capped at the PDU limit; 200-290 get single reads. The full
+# scan does not use this, it reads whole ranges itself.
+BULK_RANGES = ((0, 22), (100, 199))
+GAP_TOLERANCE = 4
+MAX_READ_COUNT = 125  # Modbus PDU limit for function 03H
+
+
+def _bulk_range(addr):
+    return next((r for r in BULK_RANGES if r[0] <= addr <= r[1]), None)
+
+
+def optimize_reads(addrs, max_span_gap=8, max_regs=MAX_READ_COUNT):
+    """Group addresses into as few (start, count) reads as the device allows"""
+    return _optimize_reads(tuple(sorted(set(addrs))), max_span_gap, max_regs)
+
+
+@lru_cache(maxsize=None)
+def _optimize_reads(addrs, max_span_gap, max_regs):
+    reads = []
+    for addr in addrs:
+        bulk = _bulk_range(addr)
+        if bulk is not None and reads:
+            start, count = reads[-1]
+            prev = start + count - 1
+            if (bulk[0] <= start and addr - prev <= max_span_gap
+                    and addr - start < max_regs):
+                reads[-1] = (start, addr - start + 1)
+                continue
+        reads.append((addr, 1))
+    return tuple(reads)
+
+
+# Read plan for the used registers, precomputed at import
+_USED_READS = optimize_reads(USED_ADDRS, GAP_TOLERANCE)
+BULK_BLOCKS = tuple(r for r in _USED_READS if _bulk_range(r[0]))
+INDIVIDUAL_ADDRS = tuple(start for start, _ in _USED_READS if not _bulk_range(start))
+
+
+# Bit field registers: (bit_index, name) per documented bit
+BITFIELDS = {
+    0: ((0, "Zone1/2 room temp control"), (1, "Zone1 water temp control"),
+        (2, "DHW power"), (3, "Zone2 water temp control")),
+    5: ((0, "Refrigerant leak detection"), (4, "Disinfection timer"),
+        (5, "Holiday away"), (6, "Silent mode"), (7, "Silent level 2"),
+        (8, "Holiday home"), (10, "ECO mode"), (11, "DHW circ pump"),
+        (12, "Climate curve Zone1"), (13, "Climate curve Zone2"),
+        (14, "C2 fault restore")),
+    10: ((1, "SG1 signal"), (2, "SG2/EVU signal")),
+    21: ((4, "Disinfection running"),),
+    128: ((1, "Defrosting"), (2, "Anti-freeze active"), (3, "Oil return"),
+          (4, "Remote on/off valid"), (6, "HT room thermostat"),
+          (7, "CL room thermostat"), (8, "Solar thermal signal"),
+          (9, "DHW anti-freeze"), (10, "SG status"), (11, "EVU status")),
+    129: ((0, "IBH1"), (1, "IBH2"), (2, "TBH"), (3, "Pump_i"), (4, "SV1"),
+          (5, "SV2"), (6, "Pump_o"), (7, "Pump_d"), (8, "Pump_c"), (9, "SV3"),
+          (10, "Crankcase heater"), (11, "Pump_s"), (12, "Alarm"), (14, "AHS")),
+    189: ((7, "3-phase power"), (8, "Temp resolution 0.1C")),
+    198: ((3, "Cooling active"), (4, "Heating active"), (5, "DHW active"),
+          (8, "Energy metering enabled"), (9, "T1 enabled"), (10, "IBH enabled"),
+          (11, "AHS mode Heat+DHW"), (14, "AHS enabled"), (15, "TBH enabled")),
+    210: ((0, "DHW priority"), (1, "Room thermostat dual zone"), (2, "RT mode set"),
+          (3, "RT function enable"), (4, "Room temp function"), (5, "Pump_i silent"),
+          (7, "Heating enable"), (9, "Cooling enable"), (10, "Pump_d disinfect"),
+          (11, "DHW priority func"), (12, "Pump_d func"), (13, "Disinfect func"),
+          (15, "DHW func")),
+    211: ((1, "Tbt function"), (3, "Double zone"), (7, "Smart grid"),
+          (8, "M1M2 TBH"), (9, "Solar kit"), (10, "Solar control"),
+          (11, "F-pipe length >=10m"), (12, "Tbt1 func"), (13, "T1T2 setting"),
+          (14, "M1M2 AHS enable"), (15, "ACS status")),
+}
+
+# Same table with the bit masks precomputed: (1 << bit_index, name)
+MASKS = {addr: tuple((1 << bit, name) for bit, name in bits)
+         for addr, bits in BITFIELDS.items()}
+
+
+def decode_bits(addr, val):
+    """Names of the documented bits that are set in a bit field register"""
+    return tuple(name for mask, name in MASKS[addr] if val & mask)
+
+
+# 32-bit counters split over a "... high" register followed by "... low":
+# (high_addr, low_addr, name), derived from the register names
+HI_LO_PAIRS = tuple(
+    (addr, addr + 1, _NAMES[addr][:-len(' high')])
+    for addr in range(MAX_ADDR)
+    if _NAMES[addr] and _NAMES[addr].endswith(' high')
+    and _NAMES[addr + 1] == _NAMES[addr][:-len(' high')] + ' low'
+)
+
+
+def decode_hilo(values, pairs=HI_LO_PAIRS):
+    """Combine 32-bit pairs present in `values` ({addr: raw}): {high_addr: kWh}"""
+    return {hi: (values[hi] << 16 | values[lo]) / 100
+            for hi, lo, _ in pairs if hi in values and lo in values}
+
+
+# How to turn a raw register into a value. Registers not listed are plain u16.
+# hi_lo_u32*0.01 is keyed on the high register; the low register follows it.
+_SPEC_GROUPS = {
+    's16': (104, 105, 107, 108, 109, 110, 112, 113, 135, 215, 216, 219, 226,
+            227, 231, 232, 233, 237, 243, 244, 263, 264, 267, 268),
+    'u16*0.01': (138, 140, 148, 149, 150, 151, 164, 171, 178, 179, 180, 181,
+                 182, 183, 184, 185, 186, 275, 276),
+    'u16*0.1': (118, 133, 192, 193, 194, 290),
+    'u16*0.5': (205, 206),
+    'u16*10': (134,),
+    'u16*100': (250, 251, 252),
+    'hi_lo_u32*0.01': tuple(hi for hi, _, _ in HI_LO_PAIRS),
+    'packed_zone': (2, 6, 201, 202, 203, 204),
+    'bitfield': tuple(BITFIELDS),
+    'sentinel_65535': (106, 191),
+    'sentinel_255': (120, 121, 136, 137, 141),
+}
+DECODE_SPEC = {addr: kind for kind, addrs in _SPEC_GROUPS.items() for addr in addrs}
+_HI_LO_LOW = frozenset(addr + 1 for addr in _SPEC_GROUPS['hi_lo_u32*0.01'])
+
+
+# Scale factor per address, applied after sign extension (for 32-bit pairs:
+# to the combined value at the high address). None where the register is
+# not a single number: packed zones, bit fields, undocumented addresses.
+_SCALES = {
+    'u16': 1, 's16': 1, 'sentinel_65535': 1, 'sentinel_255': 1,
+    'u16*0.01': 0.01, 'u16*0.1': 0.1, 'u16*0.5': 0.5, 'u16*10': 10, 'u16*100': 100,
+    'hi_lo_u32*0.01': 0.01,
+}
+SCALE = [None] * (MAX_ADDR + 1)
+for _addr in REGISTERS:
+    if _addr not in _HI_LO_LOW:
+        SCALE[_addr] = _SCALES.get(DECODE_SPEC.get(_addr, 'u16'))
+del _addr
+
+# Raw value meaning "not available / no sensor" per address, None if none
+_SENTINELS = {'sentinel_65535': 0xFFFF, 'sentinel_255': 0xFF}
+SENTINEL_VALUE = [None] * (MAX_ADDR + 1)
+for _addr, _kind in DECODE_SPEC.items():
+    SENTINEL_VALUE[_addr] = _SENTINELS.get(_kind)
+del _addr, _kind
+
+
+def _s16(val):
+    return val - 0x10000 if val & 0x8000 else val
+
+
+def _bind_decoder(addr, kind):
+    """Decoder for one register: fn(raw, i) -> value, i = index into raw"""
+    if kind == 's16':
+        return lambda raw, i: _s16(raw[i])
+    if kind.startswith('u16*'):
+        scale = SCALE[addr]
+        return lambda raw, i: raw[i] * scale
+    if kind == 'hi_lo_u32*0.01':
+        return lambda raw, i: (raw[i] << 16 | raw[i + 1]) / 100 if i + 1 < len(raw) else None
+    if kind == 'packed_zone':
+        return lambda raw, i: (raw[i] & 0xFF, raw[i] >> 8)
+    if kind == 'bitfield':
+        return lambda raw, i: decode_bits(addr, raw[i])
+    sentinel = SENTINEL_VALUE[addr]
+    if sentinel == 0xFFFF:
+        return lambda raw, i: None if raw[i] == sentinel else _s16(raw[i])
+    if sentinel is not None:
+        return lambda raw, i: None if raw[i] == sentinel else raw[i]
+    return lambda raw, i: raw[i]
+
+
+# Decoder per address, bound once so decoding does no per-field dispatch.
+# None for undocumented addresses and for the low half of 32-bit pairs.
+_DECODERS = [
+    _bind_decoder(addr, DECODE_SPEC.get(addr, 'u16'))
+    if _NAMES[addr] is not None and addr not in _HI_LO_LOW else None
+    for addr in range(MAX_ADDR + 1)
+]
+
+
+def decode_block(start, raw):
+    """Decode raw values of a bulk read starting at `start` into {addr: value}.
+
+    Only documented registers are decoded. "Not available" sentinels become
+    None, packed zones a (zone1, zone2) tuple, bit fields a tuple of set bits.
+    """
+    out = {}
+    for i, decode in enumerate(_DECODERS[start:start + len(raw)]):
+        if decode is not None:
+            out[start + i] = decode(raw, i)
+    return out
+
+
+class LastSnapshot:
+    """Last raw block and its decoded values per block start.
+
+    Owned by the polling loop. Most of the operating block changes slowly,
+    so a poll that returns the same raw values reuses the previous decode.
+    """
+
+    def __init__(self):
+        self.raw = {}
+        self.decoded = {}
+
+    def decode(self, start, raw):
+        """decode_block() of `raw`, read-only since it is shared between polls"""
+        raw = tuple(raw)
+        if self.raw.get(start) != raw:
+            self.raw[start] = raw
+            self.decoded[start] = MappingProxyType(decode_block(start, raw))
+        return self.decoded[start]
+
+
+# Display unit and precision per register: template taking the raw and the
+# scaled value. The factor comes from SCALE; low halves of 32-bit pairs are
+# shown with the scale of their pair.
+_FORMATS = {
+    118: '{} ({:.1f} A)',       # ODU current
+    133: '{} ({:.1f} A)',       # DC bus current
+    134: '{} ({:.0f} V)',       # DC bus voltage
+    138: '{} ({:.2f} m3/h)',    # Water flow
+    **dict.fromkeys((140, 148, 149, 150), '{} ({:.2f} kW)'),
+    **dict.fromkeys((*range(143, 147), *range(152, 164)), '{} ({:.2f} kWh)'),
+    **dict.fromkeys((151, 164), '{} ({:.2f})'),  # COP
+    192: '{} ({:.1f}%)',        # PWM
+}
+
+
+def _formatter(addr, template):
+    factor = SCALE[addr - 1] if addr in _HI_LO_LOW else SCALE[addr]
+    return lambda val: template.format(val, val * factor)
+
+
+FORMATTERS = {addr: _formatter(addr, fmt) for addr, fmt in _FORMATS.items()}
+
+
 def format_value(addr, val):
     """Format value based on known scaling"""
-    if addr in [118]:  # ODU current x0.1
-        return f"{val} ({val * 0.1:.1f} A)"
-    elif addr in [133]:  # DC bus current x10
-        return f"{val} ({val * 0.1:.1f} A)"
-    elif addr in [134]:  # DC bus voltage /10
-        return f"{val} ({val * 0.1:.1f} V)"
-    elif addr in [138]:  # Water flow x0.01
-        return f"{val} ({val * 0.01:.2f} m3/h)"
-    elif addr in [140, 148, 149, 150]:  # kW x0.01
-        return f"{val} ({val * 0.01:.2f} kW)"
-    elif addr in [143, 144, 145, 146, 152, 153, 154, 155, 156, 157, 158, 159, 160, 161, 162, 163]:  # kWh x0.01
-        return f"{val} ({val * 0.01:.2f} kWh)"
-    elif addr in [151, 164]:  # COP x0.01
-        return f"{val} ({val * 0.01:.2f})"
-    elif addr in [192]:  # PWM x10
-        return f"{val} ({val * 0.1:.1f}%)"
-    return str(val)
+    fmt = FORMATTERS.get(addr)
+    return fmt(val) if fmt else str(val)
 
 
-def scan_registers():
-    client = ModbusTcpClient('192.168.178.121', port=8899, timeout=5)
+def _tune_socket(client):
+    client.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    client.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+
+def make_client(host='192.168.178.121', port=8899):
+    """Connected ModbusTcpClient with Nagle disabled, or None.
+
+    Each request is a tiny frame waiting on its reply; without TCP_NODELAY
+    they can stall on the delayed-ACK timer. Keepalive stops the EW11-A
+    from silently dropping an idle connection.
+    """
+    client = ModbusTcpClient(host, port=port, timeout=5)
     if not client.connect():
-        print('Connection failed')
-        return
+        return None
+    _tune_socket(client)
+    return client
 
-    print('Connected! Scanning registers...\n')
-    print(f'{"Addr":<6} {"Name":<30} {"Value":<25} {"Description"}')
-    print('-' * 100)
 
-    all_values = {}
+# Full scan: every implemented address. Reads rejected with exception code 2
+# (illegal data address) are bisected down to the spans the device accepts;
+# those spans are cached for the next run.
+SCAN_RANGES = ((0, 23), (100, 100), (200, MAX_ADDR - 199))
+SPAN_CACHE = os.path.expanduser('~/.midea_spans.json')
+ILLEGAL_DATA_ADDRESS = 2
+READ_RETRIES = 3
 
-    # Bulk read: control (0-22) and operating (100-199) registers
-    for start, count in [(0, 23), (100, 100)]:
+
+def _read_into(client, start, count, values):
+    """One read into `values`; 0 on success, else the exception code.
+
+    A connection error (WiFi drop, gateway reset) closes and reopens the
+    connection and retries with a short backoff; after READ_RETRIES failed
+    attempts the last error is raised.
+    """
+    for attempt in range(READ_RETRIES):
         try:
             result = client.read_holding_registers(address=start, count=count, device_id=2)
-            if not result.isError():
-                for i, val in enumerate(result.registers):
-                    addr = start + i
-                    all_values[addr] = val
-        except Exception as e:
-            pass
-
-    # Parameter registers (200-290) - bulk read fails, must read one-by-one
-    param_addrs = list(range(200, 291))
-    for addr in param_addrs:
-        try:
-            result = client.read_holding_registers(address=addr, count=1, device_id=2)
-            if not result.isError():
-                all_values[addr] = result.registers[0]
-        except Exception as e:
-            pass
+            break
+        except (ModbusException, OSError):
+            if attempt == READ_RETRIES - 1:
+                raise
+            time.sleep(0.05 * 2 ** attempt)
+            client.close()
+            if client.connect():
+                _tune_socket(client)
+    if result.isError():
+        return getattr(result, 'exception_code', None)
+    for i, val in enumerate(result.registers):
+        values[start + i] = val
+    return 0
+
+
+def bulk_read(client, start, count, values, spans):
+    """Read registers [start, start+count) into `values` ({addr: raw}).
+
+    On exception code 2 the range is split in half and each half read
+    again, down to single registers. Successful (start, count) reads are
+    appended to `spans`. Returns False if a read got no usable answer: a
+    connection error, or another exception code (gateway target did not
+    respond, device busy) that may be transient.
+    """
+    try:
+        code = _read_into(client, start, count, values)
+    except (ModbusException, OSError):
+        return False
+    if code == 0:
+        spans.append((start, count))
+        return True
+    if code != ILLEGAL_DATA_ADDRESS:
+        return False
+    if count == 1:
+        return True
+    half = count // 2
+    ok = bulk_read(client, start, half, values, spans)
+    return bulk_read(client, start + half, count - half, values, spans) and ok
+
+
+def merge_spans(client, spans, values):
+    """Try to join adjacent spans into single reads; return the merged list.
+
+    Bisection splits at midpoints, so spans it finds are often smaller than
+    what the device accepts. Each adjacent pair is read as one span once;
+    a pair that fails stays split.
+    """
+    merged = []
+    for start, count in sorted(spans):
+        if merged:
+            prev_start, prev_count = merged[-1]
+            total = prev_count + count
+            if prev_start + prev_count == start and total <= MAX_READ_COUNT:
+                try:
+                    ok = _read_into(client, prev_start, total, values) == 0
+                except (ModbusException, OSError):
+                    ok = False
+                if ok:
+                    merged[-1] = (prev_start, total)
+                    continue
+        merged.append((start, count))
+    return merged
+
+
+def _load_spans():
+    """Cached (start, count) spans, or None if missing or not valid"""
+    try:
+        with open(SPAN_CACHE, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, list):
+        return None
+    spans = []
+    for span in data:
+        if not (isinstance(span, list) and len(span) == 2
+                and all(type(v) is int for v in span)):
+            return None
+        start, count = span
+        if start < 0 or count < 1 or start + count - 1 > MAX_ADDR:
+            return None
+        spans.append((start, count))
+    return spans
+
+
+def _save_spans(spans):
+    try:
+        with open(SPAN_CACHE, 'w', encoding='utf-8') as f:
+            json.dump(sorted(spans), f)
+    except OSError:
+        pass
+
+
+# Detailed descriptions in the dump: indented, wrapped to 95 columns
+_WRAPPER = textwrap.TextWrapper(width=95, initial_indent=' ' * 8, subsequent_indent=' ' * 8,
+                                break_long_words=False, break_on_hyphens=False)
+
+
+@lru_cache(maxsize=None)
+def wrapped_detail(addr):
+    """Detailed description formatted for the dump, '' if there is none"""
+    return _WRAPPER.fill(_DETAILS[addr] or "")
+
+
+# Values undocumented registers hold when unused; not worth printing
+_BLANK_VALUES = frozenset({0, 0x7F, 0xFF, 0x7FFF, 0xFFFF})
 
-    # Print all scanned registers (known and unknown)
+
+def scan_registers():
+    client = make_client()
+    if client is None:
+        print('Connection failed')
+        return
+
+    print('Connected! Scanning registers...\n', flush=True)
+
+    all_values = {}
+
+    # Read the spans that worked last time, or discover them by bisection
+    cached = _load_spans()
+    spans = []
+    complete = True
+    for start, count in cached or SCAN_RANGES:
+        if not bulk_read(client, start, count, all_values, spans):
+            complete = False
+    if complete and spans != cached:
+        _save_spans(merge_spans(client, spans, all_values))
+
+    # Collect the report and write it in one go
+    out = [f'{"Addr":<6} {"Name":<30} {"Value":<25} {"Description"}', '-' * 100]
+    append = out.append
+
+    # All scanned registers (known and unknown)
     for addr in sorted(all_values.keys()):
         val = all_values[addr]
-        if addr in REGISTERS:
-            name, desc, used, detail = REGISTERS[addr]
+        name = _NAMES[addr]
+        if name is not None:
             formatted = format_value(addr, val)
-            marker = "  " if used else "* "
-            print(f'{marker}{addr:<5} {name:<30} {formatted:<25} {desc}')
-            if detail:
-                # Wrap detailed description to ~90 chars per line
-                indent = "        "
-                words = detail.split()
-                line = indent
-                for word in words:
-                    if len(line) + len(word) + 1 > 95:
-                        print(line)
-                        line = indent + word
-                    else:
-                        line = line + " " + word if line != indent else indent + word
-                if line != indent:
-                    print(line)
-        elif val != 0 and val != 0x7FFF and val != 0x7F and val != 0xFFFF and val != 255:
-            # Unknown register with non-zero value
-            print(f'? {addr:<5} {"(unknown)":<30} {val:<25}')
-
-
-    # Print 32-bit combined values
-    print('\n' + '-' * 100)
-    print('32-bit combined values (high<<16 + low) / 100:\n')
-    pairs = [
-        (143, 144, "Energy consumption"),
-        (145, 146, "Power output"),
-        (152, 153, "Cum system heating"),
-        (154, 155, "Cum renewable heating"),
-        (156, 157, "Cum system power"),
-        (158, 159, "Cum heating energy"),
-        (160, 161, "Cum renewable energy"),
-        (162, 163, "Cum heating power"),
-    ]
+            marker = "  " if _USED[addr] & 1 else "* "
+            append(f'{marker}{addr:<5} {name:<30} {formatted:<25} {_DESCS[addr]}')
+            if addr in MASKS:
+                bits = decode_bits(addr, val)
+                if bits:
+                    append(f'        Set: {", ".join(bits)}')
+            wrapped = wrapped_detail(addr)
+            if wrapped:
+                append(wrapped)
+        elif val not in _BLANK_VALUES:
+            # Unknown register with a meaningful value
+            append(f'? {addr:<5} {"(unknown)":<30} {val:<25}')
+
+
+    # 32-bit combined values
+    append('\n' + '-' * 100)
+    append('32-bit combined values (high<<16 + low) / 100:\n')
+    pairs = [pair for pair in HI_LO_PAIRS if reg_used(pair[0])]
+    combined = decode_hilo(all_values, pairs)
     for hi, lo, name in pairs:
-        if hi in all_values and lo in all_values:
-            combined = (all_values[hi] * 65536 + all_values[lo]) / 100
-            print(f'{hi}/{lo:<4} {name:<30} {combined:.2f} kWh')
+        if hi in combined:
+            append(f'{hi}/{lo:<4} {name:<30} {combined[hi]:.2f} kWh')
 
     client.close()
+    sys.stdout.write('\n'.join(out) + '\n')
 
 
 if __name__ == '__main__':
-    import sys
-
     # Write to both console and file
     output_file = 'register_dump.txt'
 
     class Tee:
+        """Buffers writes and copies them to all files in one go on flush"""
         def __init__(self, *files):
             self.files = files
+            self.buf = []
         def write(self, text):
-            for f in self.files:
-                f.write(text)
+            self.buf.append(text)
+            return len(text)
         def flush(self):
+            data = ''.join(self.buf)
+            self.buf.clear()
             for f in self.files:
+                f.write(data)
                 f.flush()
 
     with open(output_file, 'w', encoding='utf-8') as f:
         old_stdout = sys.stdout
         sys.stdout = Tee(sys.stdout, f)
-        scan_registers()
-        sys.stdout = old_stdout
+        try:
+            scan_registers()
+        finally:
+            sys.stdout.flush()
+            sys.stdout = old_stdout
 
     print(f'\nOutput saved to {output_file}')
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Set Zone 1 target water temperature on Midea heat pump via Modbus TCP.
 
-Called by Home Assistant automation (shell_command) when target temp changes.
-Writes to register 2 which packs Zone1 (low byte) and Zone2 (high byte),
-so we read first to preserve the Zone2 value.
+For manual use: Home Assistant writes the target itself through its modbus
+hub (see heat_pump_package_target_control.yaml). Writes to register 2 which
+packs Zone1 (low byte) and Zone2 (high byte), so we read first to preserve
+the Zone2 value.
 
 Usage: python set_target.py <temperature>
 Example: python set_target.py 35
@@ -13,16 +14,20 @@ after AP mode hardening), Modbus slave address 2.
 
 Requires: pip install pymodbus
 """
+import socket
 import sys
 from pymodbus.client import ModbusTcpClient
 
 target = int(float(sys.argv[1]))
 client = ModbusTcpClient('192.168.178.121', port=8899, timeout=5)
 if client.connect():
+    # Small request/response frames: don't let Nagle hold them back
+    client.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
     # Register 2 packs two zones: low byte = Zone1, high byte = Zone2
     result = client.read_holding_registers(address=2, count=1, device_id=2)
     if not result.isError():
         zone2 = (result.registers[0] >> 8) & 0xFF
         new_raw = (zone2 << 8) | target
-        client.write_register(address=2, value=new_raw, device_id=2)
+        if new_raw != result.registers[0]:
+            client.write_register(address=2, value=new_raw, device_id=2)
     client.close()